@@ -7,16 +7,56 @@ Calls are made to potential customers to schedule design consultations.
 """
 
 import os
-import json
 import sys
+import shlex
+import asyncio
 import argparse
-import re
-from typing import Optional
+import functools
+import contextlib
+import logging
+from logging.handlers import MemoryHandler
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+import aiohttp
+import orjson
 from dotenv import load_dotenv
+from livekit import api
+
+try:
+    import readline  # noqa: F401 - gives input() line editing and history
+except ImportError:
+    pass
 
 # Load environment variables
 load_dotenv()
 
+# Process-lifetime configuration, read once
+_AGENT_NAME = os.getenv("AGENT_NAME", "outbound_call_agent")
+_SIP_TRUNK = os.getenv("SIP_OUTBOUND_TRUNK_ID")
+_LK_URL = os.getenv("LIVEKIT_URL")
+_LK_KEY = os.getenv("LIVEKIT_API_KEY")
+_LK_SECRET = os.getenv("LIVEKIT_API_SECRET")
+_DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "16"))
+
+# Dispatch metadata with its constant fields pre-rendered. phone_number is always
+# a validated +1XXXXXXXXXX string; lead_id can come from the CLI and is JSON-encoded
+# with orjson.
+_METADATA_TMPL = '{"phone_number": "%s", "lead_id": %s, "call_type": "sales_outbound", "agent_name": "Jack"}'
+
+# Built once at import; validate_phone_number runs per row in batch mode
+_NON_DIGIT_BYTES = bytes(c for c in range(128) if not 0x30 <= c <= 0x39)
+
+logger = logging.getLogger(__name__)
+
+def is_plausible_phone(phone: str) -> bool:
+    """
+    Cheap length-only pre-filter that rejects obvious garbage (short headers or
+    comments, oversized lines) before the full validation in validate_phone_number.
+    Non-ASCII characters are allowed: pasted or exported numbers often carry
+    NBSPs or non-breaking hyphens, which validate_phone_number strips.
+    """
+    return 10 <= len(phone) <= 32
+
+@functools.lru_cache(maxsize=4096)
 def validate_phone_number(phone: str) -> Optional[str]:
     """
     Validate and format phone number for outbound calling.
@@ -27,62 +67,93 @@ def validate_phone_number(phone: str) -> Optional[str]:
     Returns:
         Optional[str]: Formatted phone number or None if invalid
     """
-    # Remove all non-digit characters
-    digits_only = re.sub(r'[^\d]', '', phone)
-
-    # Handle US numbers
-    if len(digits_only) == 10:
-        # Add US country code
-        formatted = f"+1{digits_only}"
-    elif len(digits_only) == 11 and digits_only.startswith('1'):
-        # Already has US country code
-        formatted = f"+{digits_only}"
-    else:
+    # Work on ASCII bytes: non-ASCII is dropped by the encode, then every
+    # non-digit byte is deleted in one C-level pass
+    digits = phone.encode('ascii', 'ignore').translate(None, _NON_DIGIT_BYTES)
+
+    # Handle US numbers: keep the 10-digit national number
+    if len(digits) == 11 and digits[0] == 0x31:  # b'1' country code
+        digits = digits[1:]
+    elif len(digits) != 10:
         return None
 
-    # Validate US phone number format
-    if re.match(r'^\+1[2-9]\d{2}[2-9]\d{6}$', formatted):
-        return formatted
+    # Validate US phone number format (NXXNXXXXXX): digits is already all
+    # digits, so area code and exchange only need a leading digit >= '2'
+    if digits[0] >= 0x32 and digits[3] >= 0x32:
+        return '+1' + digits.decode('ascii')
     else:
         return None
 
-def create_dispatch_command(phone_number: str, lead_id: Optional[str] = None) -> str:
+def build_dispatch(phone_number: str, lead_id: Optional[str] = None) -> Tuple[str, str]:
     """
-    Create LiveKit dispatch command for outbound call.
+    Build the room name and metadata for an outbound call dispatch.
 
     Args:
         phone_number (str): Validated phone number
         lead_id (str, optional): Lead identifier
 
     Returns:
-        str: LiveKit CLI dispatch command
+        Tuple[str, str]: Room name and JSON-encoded dispatch metadata
     """
+    # validate_phone_number guarantees +1XXXXXXXXXX, so dropping the '+' is enough
+    naked = phone_number[1:]
+
     # Generate unique room name
-    room_name = f"outbound_call_{phone_number.replace('+', '').replace('-', '')}_{lead_id or 'manual'}"
+    room_name = f"outbound_call_{naked}_{lead_id or 'manual'}"
 
     # Create metadata with phone number
-    metadata = {
-        "phone_number": phone_number,
-        "lead_id": lead_id or f"manual_{phone_number.replace('+', '')}",
-        "call_type": "sales_outbound",
-        "agent_name": "Jack"
-    }
+    metadata_json = _METADATA_TMPL % (phone_number, orjson.dumps(lead_id or f"manual_{naked}").decode())
 
-    # Build LiveKit CLI command
-    agent_name = os.getenv("AGENT_NAME", "outbound_call_agent")
+    return room_name, metadata_json
+
+def create_dispatch_command(phone_number: str, lead_id: Optional[str] = None) -> List[str]:
+    """
+    Create the LiveKit CLI command equivalent to a dispatch, for dry runs and
+    manual use.
 
-    command = f"lk dispatch create --new-room --room-name {room_name} --agent-name {agent_name} --metadata '{json.dumps(metadata)}'"
+    Args:
+        phone_number (str): Validated phone number
+        lead_id (str, optional): Lead identifier
+
+    Returns:
+        List[str]: LiveKit CLI dispatch command as an argv list (no shell involved)
+    """
+    room_name, metadata_json = build_dispatch(phone_number, lead_id)
+
+    # Build LiveKit CLI command
+    command = [
+        "lk", "dispatch", "create", "--new-room",
+        "--room-name", room_name,
+        "--agent-name", _AGENT_NAME,
+        "--metadata", metadata_json,
+    ]
 
     return command
 
-def dispatch_single_call(phone_number: str, lead_id: Optional[str] = None, execute: bool = False) -> bool:
+@contextlib.asynccontextmanager
+async def _livekit_client(execute: bool) -> AsyncIterator[Optional[api.LiveKitAPI]]:
     """
-    Dispatch a single outbound call.
+    Yield one LiveKit API client for a whole run so every dispatch reuses the
+    same authenticated HTTP connection pool. Dry runs get None.
+    """
+    if not execute:
+        yield None
+        return
+
+    lkapi = api.LiveKitAPI(_LK_URL, _LK_KEY, _LK_SECRET)
+    try:
+        yield lkapi
+    finally:
+        await lkapi.aclose()
+
+async def _dispatch_call_async(lkapi: Optional[api.LiveKitAPI], phone_number: str, lead_id: Optional[str] = None) -> bool:
+    """
+    Validate a phone number and dispatch the agent to a new room for it.
 
     Args:
+        lkapi (LiveKitAPI, optional): Shared client, or None for a dry run
         phone_number (str): Phone number to call
         lead_id (str, optional): Lead identifier
-        execute (bool): Whether to execute the command or just print it
 
     Returns:
         bool: Success status
@@ -90,54 +161,118 @@ def dispatch_single_call(phone_number: str, lead_id: Optional[str] = None, execu
     # Validate phone number
     validated_phone = validate_phone_number(phone_number)
     if not validated_phone:
-        print(f"❌ Invalid phone number: {phone_number}")
+        logger.warning("❌ Invalid phone number: %s", phone_number)
         return False
 
-    print(f"📞 Preparing call to: {validated_phone}")
+    logger.info("📞 Preparing call to: %s", validated_phone)
 
-    # Create dispatch command
-    command = create_dispatch_command(validated_phone, lead_id)
-
-    if execute:
-        print(f"🚀 Executing: {command}")
-        result = os.system(command)
-        if result == 0:
-            print(f"✅ Call dispatched successfully to {validated_phone}")
-            return True
-        else:
-            print(f"❌ Failed to dispatch call to {validated_phone}")
-            return False
-    else:
-        print(f"🔍 Command to execute: {command}")
-        print("💡 Add --execute to actually make the call")
+    if lkapi is None:
+        logger.info("🔍 Command to execute: %s", shlex.join(create_dispatch_command(validated_phone, lead_id)))
+        logger.info("💡 Add --execute to actually make the call")
         return True
 
-def dispatch_batch_calls(phone_list: list, execute: bool = False) -> None:
+    room_name, metadata_json = build_dispatch(validated_phone, lead_id)
+    logger.info("🚀 Dispatching %s to room %s", _AGENT_NAME, room_name)
+    try:
+        await lkapi.room.create_room(api.CreateRoomRequest(name=room_name))
+        await lkapi.agent_dispatch.create_dispatch(api.CreateAgentDispatchRequest(
+            room=room_name,
+            agent_name=_AGENT_NAME,
+            metadata=metadata_json
+        ))
+    except (api.TwirpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error("❌ Failed to dispatch call to %s: %s", validated_phone, e)
+        return False
+
+    logger.info("✅ Call dispatched successfully to %s", validated_phone)
+    return True
+
+def dispatch_single_call(phone_number: str, lead_id: Optional[str] = None, execute: bool = False) -> bool:
+    """
+    Dispatch a single outbound call.
+
+    Args:
+        phone_number (str): Phone number to call
+        lead_id (str, optional): Lead identifier
+        execute (bool): Whether to dispatch the call or just print the command
+
+    Returns:
+        bool: Success status
+    """
+    async def run() -> bool:
+        async with _livekit_client(execute) as lkapi:
+            return await _dispatch_call_async(lkapi, phone_number, lead_id)
+
+    return asyncio.run(run())
+
+def dispatch_batch_calls(phone_list: Iterable, execute: bool = False) -> None:
     """
-    Dispatch multiple outbound calls from a list.
+    Dispatch multiple outbound calls from an iterable.
+
+    All calls share one LiveKit API client and run concurrently, at most
+    DISPATCH_WORKERS (default 16) at a time. The iterable is consumed lazily,
+    so a large batch file starts dispatching before it has been fully read.
 
     Args:
-        phone_list (list): List of phone numbers or (phone, lead_id) tuples
-        execute (bool): Whether to execute commands or just print them
+        phone_list (Iterable): Phone numbers or (phone, lead_id) tuples
+        execute (bool): Whether to dispatch calls or just print the commands
     """
-    success_count = 0
-    total_count = len(phone_list)
+    async def run() -> Tuple[int, int]:
+        success_count = 0
+        total_count = 0
+        slots = asyncio.Semaphore(_DISPATCH_WORKERS)
+        pending = set()
+
+        async def dispatch_item(lkapi, phone, lead_id) -> None:
+            nonlocal success_count
+            try:
+                if await _dispatch_call_async(lkapi, phone, lead_id):
+                    success_count += 1
+            finally:
+                slots.release()
+
+        async with _livekit_client(execute) as lkapi:
+            for item in phone_list:
+                total_count += 1
+                if isinstance(item, tuple):
+                    phone, lead_id = item
+                else:
+                    phone, lead_id = item, None
+                if not is_plausible_phone(phone):
+                    logger.warning("❌ Invalid phone number: %s", phone)
+                    continue
 
-    print(f"📋 Processing {total_count} outbound calls...")
+                await slots.acquire()
+                task = asyncio.create_task(dispatch_item(lkapi, phone, lead_id))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
 
-    for i, item in enumerate(phone_list, 1):
-        print(f"\n--- Call {i}/{total_count} ---")
+            if pending:
+                await asyncio.gather(*pending)
 
-        if isinstance(item, tuple):
-            phone, lead_id = item
-        else:
-            phone, lead_id = item, None
+        return success_count, total_count
 
-        success = dispatch_single_call(phone, lead_id, execute)
-        if success:
-            success_count += 1
+    logger.info("📋 Processing outbound calls...")
 
-    print(f"\n📊 Results: {success_count}/{total_count} calls processed successfully")
+    success_count, total_count = asyncio.run(run())
+
+    logger.info("\n📊 Results: %d/%d calls processed successfully", success_count, total_count)
+
+def _configure_logging(buffered: bool) -> logging.Handler:
+    """
+    Send dispatch progress to stdout as plain lines.
+
+    In batch mode records are buffered and written in chunks instead of one
+    write per line; the caller must flush the returned handler when done.
+    """
+    handler: logging.Handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    if buffered:
+        handler = MemoryHandler(capacity=256, target=handler)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return handler
 
 def main():
     parser = argparse.ArgumentParser(description="Dispatch outbound sales calls")
@@ -149,32 +284,37 @@ def main():
     args = parser.parse_args()
 
     # Check environment
-    if not os.getenv("SIP_OUTBOUND_TRUNK_ID"):
+    if not _SIP_TRUNK:
         print("❌ Error: SIP_OUTBOUND_TRUNK_ID not found in environment")
         sys.exit(1)
 
-    if not os.getenv("LIVEKIT_URL") or not os.getenv("LIVEKIT_API_KEY"):
+    if not _LK_URL or not _LK_KEY or not _LK_SECRET:
         print("❌ Error: LiveKit credentials not found in environment")
         sys.exit(1)
 
     print("🏢 Floor Covering International - Outbound Call Dispatcher")
     print("=" * 60)
 
+    log_handler = _configure_logging(buffered=bool(args.batch))
+
     if args.batch:
         # Batch calling from file
         try:
-            with open(args.batch, 'r') as f:
-                phone_list = [line.strip() for line in f if line.strip()]
-            dispatch_batch_calls(phone_list, args.execute)
+            with open(args.batch, 'r', buffering=65536) as f:
+                phone_iter = (line.strip() for line in f if line.strip())
+                dispatch_batch_calls(phone_iter, args.execute)
         except FileNotFoundError:
             print(f"❌ Error: File {args.batch} not found")
             sys.exit(1)
+        finally:
+            log_handler.flush()
     elif args.phone:
         # Single call
         dispatch_single_call(args.phone, args.lead_id, args.execute)
     else:
         # Interactive mode
         print("📞 Interactive Mode - Enter phone numbers to call")
+        print("💡 Type 'batch:' to paste many numbers (newline or ';' separated, end with Ctrl-D)")
         print("💡 Type 'quit' to exit")
 
         while True:
@@ -183,10 +323,15 @@ def main():
                 if phone.lower() in ['quit', 'exit', 'q']:
                     break
 
+                if phone.lower() == 'batch:':
+                    pasted = sys.stdin.read().replace(';', '\n')
+                    dispatch_batch_calls((line.strip() for line in pasted.splitlines() if line.strip()), args.execute)
+                    continue
+
                 lead_id = input("Lead ID (optional): ").strip() or None
                 dispatch_single_call(phone, lead_id, args.execute)
 
-            except KeyboardInterrupt:
+            except (KeyboardInterrupt, EOFError):
                 print("\n👋 Goodbye!")
                 break
 
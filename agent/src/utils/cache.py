@@ -0,0 +1,38 @@
+import time
+import hashlib
+from collections import OrderedDict
+
+
+class SupportDocCache:
+    """Exact-match TTL cache for support documentation answers, keyed on the normalized query"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    @staticmethod
+    def cache_key(query: str) -> str:
+        return hashlib.sha256(query.strip().lower().encode()).hexdigest()
+
+    def get(self, query: str) -> str | None:
+        key = self.cache_key(query)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, query: str, value: str):
+        key = self.cache_key(query)
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        # Evict least recently used entries once over capacity
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
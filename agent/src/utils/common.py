@@ -1,6 +1,6 @@
 import os
 import sys
-import uuid
+import secrets
 import logging
 from datetime import datetime
 from zoneinfo import ZoneInfo  # Python 3.9+
@@ -21,6 +21,12 @@ MESSAGE_TYPE_TOOL = "tool"
 ROLE_USER = "user"
 ROLE_ASSISTANT = "assistant"
 
+# Resolved once; ZoneInfo lookups otherwise go through its cache on every timestamp
+_BERLIN = ZoneInfo("Europe/Berlin")
+
+# Characters dropped from phone numbers when building identities
+_PHONE_STRIP = str.maketrans("", "", "+-")
+
 
 def is_console_mode():
     """Check if running in console mode (not connected to LiveKit)"""
@@ -29,11 +35,14 @@ def is_console_mode():
 
 def get_timestamp_iso_berlin():
     """Get current timestamp in ISO format for Berlin timezone"""
-    berlin_tz = ZoneInfo("Europe/Berlin")
-    now_berlin = datetime.now(tz=berlin_tz)
-    return now_berlin.isoformat()
+    return datetime.now(tz=_BERLIN).isoformat()
+
+
+def normalize_phone_number(phone_number: str) -> str:
+    """Strip '+' and '-' from a phone number in one pass (e.g. "+1-510-555-0100" -> "15105550100")"""
+    return phone_number.translate(_PHONE_STRIP)
 
 
 def generate_session_id():
     """Generate a custom session ID (do this ONCE per session)"""
-    return str(uuid.uuid4())
\ No newline at end of file
+    return secrets.token_hex(16)
\ No newline at end of file
@@ -1,29 +1,68 @@
 import os
-import json
+import orjson
 import textwrap
+import functools
+import random
 import asyncio
 import aiohttp
-from livekit import agents
+from typing import Final, TYPE_CHECKING
 
-from .common import logger
+from .common import logger, normalize_phone_number
+from .cache import SupportDocCache
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing livekit.agents at runtime is heavy
+    from livekit import agents
+
+
+_BUSINESS_RULES: Final[str] = "Focus on scheduling appointments efficiently and professionally for Floor Covering International."
+
+# Encoded once; returned whenever the upstream search fails
+_FALLBACK_SUPPORT_DOCUMENTATION: Final[str] = orjson.dumps({
+    "content": "I'm having trouble accessing the support documentation right now. Please try again or contact support directly.",
+    "citations": []
+}).decode()
+
+# Caps concurrent Perplexity requests per worker so a burst queues here instead of
+# stacking up against provider rate limits and all hitting the 15s timeout together
+_perplexity_slots = asyncio.Semaphore(int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", "8")))
+
+# Transient upstream failures are retried (100ms -> 400ms, jittered); other errors fail fast
+_SEARCH_ATTEMPTS = 3
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRY_DELAY = 2.0  # a caller is on the line; never sleep longer than this between attempts
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Backoff before the next attempt, honouring a numeric Retry-After header when the server sends one"""
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_RETRY_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own backoff
+    return 0.1 * (4 ** attempt) * (0.5 + random.random() * 0.5)
+
+
+# Shared by every Perplexity instance; dedented once at import
+_SYSTEM_PROMPT = textwrap.dedent("""
+    Search the web for the issue and provide a concise answer. 
+    Your answer will be used by a Tonies customer support agent, who helps Tonies' customers with set-up and troubleshooting.
+    Keep your answers clear, concise and actionable.
+
+    ALWAYS produce your response in this form:
+
+    Confidence: low
+    Some response for the Tonies' customer support agent.
+
+    Different values for Confidence are {low, medium, high}.
+    """)
 
 
 class Perplexity:
     """Internal Perplexity API client for support documentation search"""
     
     def __init__(self):
-        self.system_prompt = textwrap.dedent("""
-            Search the web for the issue and provide a concise answer. 
-            Your answer will be used by a Tonies customer support agent, who helps Tonies' customers with set-up and troubleshooting.
-            Keep your answers clear, concise and actionable.
-
-            ALWAYS produce your response in this form:
-
-            Confidence: low
-            Some response for the Tonies' customer support agent.
-
-            Different values for Confidence are {low, medium, high}.
-        """)
+        self.system_prompt = _SYSTEM_PROMPT
 
         self.model = "sonar"
         self.base_url = "https://api.perplexity.ai/chat/completions"
@@ -31,6 +70,34 @@ class Perplexity:
             "Authorization": f"Bearer {os.getenv('PERPLEXITY_API_KEY')}",
             "Content-Type": "application/json"
         }
+        # Created lazily on the running event loop and reused so calls share pooled keep-alive connections
+        self._session: aiohttp.ClientSession | None = None
+        self._connector_kwargs = dict(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60)
+        # Session-wide: fail fast on connect, leave most of the budget for the answer
+        self._timeout = aiohttp.ClientTimeout(total=15, sock_connect=3, sock_read=12)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connector_kwargs),
+                timeout=self._timeout,
+                headers=self.headers
+            )
+        return self._session
+
+    async def warmup(self):
+        """Open a pooled connection (DNS + TCP + TLS) ahead of the first search; the response is ignored."""
+        session = await self._get_session()
+        try:
+            async with session.head(self.base_url, timeout=aiohttp.ClientTimeout(total=5)):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"Perplexity warmup failed: {e}")
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def search(self, query):
         payload = {
@@ -46,29 +113,66 @@ class Perplexity:
             ]
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                    self.base_url, headers=self.headers, json=payload, timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    content = result['choices'][0]['message']['content']
-                    citations = result['citations']
-                    result_message = json.dumps({"content": content, "citations": citations})
-                    return result_message
-                else:
-                    error_text = await response.text()
-                    raise aiohttp.ClientResponseError(
-                        request_info=response.request_info,
-                        history=response.history,
-                        status=response.status,
-                        message=error_text
-                    )
+        session = await self._get_session()
+        for attempt in range(_SEARCH_ATTEMPTS):
+            async with _perplexity_slots:
+                async with session.post(self.base_url, json=payload) as response:
+                    if response.status == 200:
+                        # orjson on the raw body is faster than aiohttp's stdlib-json decode
+                        result = orjson.loads(await response.read())
+                        content = result['choices'][0]['message']['content']
+                        citations = result['citations']
+                        result_message = orjson.dumps({"content": content, "citations": citations}).decode()
+                        return result_message
+                    elif response.status in _RETRYABLE_STATUSES and attempt + 1 < _SEARCH_ATTEMPTS:
+                        delay = _retry_delay(attempt, response.headers.get("Retry-After"))
+                    else:
+                        error_text = await response.text()
+                        raise aiohttp.ClientResponseError(
+                            request_info=response.request_info,
+                            history=response.history,
+                            status=response.status,
+                            message=error_text
+                        )
+
+            # Back off outside the semaphore so waiting doesn't hold a request slot
+            logger.warning(f"Perplexity returned {response.status}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
 
 
 # Create a singleton instance for internal use
 _perplexity = Perplexity()
 
+# Successful answers only; fallbacks are never cached so the next call retries upstream
+_support_doc_cache = SupportDocCache(maxsize=1024, ttl=3600)
+
+# Searches currently awaiting Perplexity, keyed like the cache
+_inflight_searches: dict[str, asyncio.Future] = {}
+
+
+async def warmup_http_sessions():
+    """Pre-connect pooled HTTP sessions; started in the background at session start."""
+    if os.getenv("PERPLEXITY_API_KEY"):
+        await _perplexity.warmup()
+
+
+async def close_http_sessions():
+    """Close pooled HTTP sessions; called from the session shutdown hook."""
+    await _perplexity.close()
+
+
+async def _search_support_documentation(query: str) -> str:
+    """Query Perplexity and cache the answer, falling back to a canned response on failure."""
+    try:
+        result = await _perplexity.search(query)
+        logger.info(f"Successfully fetched support documentation for query: {query}")
+        _support_doc_cache.set(query, result)
+        return result
+    except Exception as e:
+        logger.error(f"Error fetching support documentation: {str(e)}")
+        # Return a fallback response
+        return _FALLBACK_SUPPORT_DOCUMENTATION
+
 
 async def fetch_support_documentation(query: str) -> str:
     """
@@ -76,6 +180,7 @@ async def fetch_support_documentation(query: str) -> str:
     
     This function abstracts the implementation details of how support documentation
     is retrieved. Currently uses Perplexity API to search tonies.com.
+    Concurrent calls for the same (normalized) query share one upstream request.
     
     Args:
         query: The support question or issue to search for
@@ -83,21 +188,25 @@ async def fetch_support_documentation(query: str) -> str:
     Returns:
         JSON string containing the search result with content and citations
     """
-    try:
-        result = await _perplexity.search(query)
-        logger.info(f"Successfully fetched support documentation for query: {query}")
-        return result
-    except Exception as e:
-        logger.error(f"Error fetching support documentation: {str(e)}")
-        # Return a fallback response
-        fallback_response = {
-            "content": "I'm having trouble accessing the support documentation right now. Please try again or contact support directly.",
-            "citations": []
-        }
-        return json.dumps(fallback_response)
+    cached = _support_doc_cache.get(query)
+    if cached is not None:
+        logger.info(f"Support documentation cache hit for query: {query}")
+        return cached
+
+    key = SupportDocCache.cache_key(query)
+    search = _inflight_searches.get(key)
+    if search is None:
+        search = asyncio.ensure_future(_search_support_documentation(query))
+        _inflight_searches[key] = search
+        search.add_done_callback(lambda _: _inflight_searches.pop(key, None))
+    else:
+        logger.info(f"Joining in-flight support documentation search for query: {query}")
+
+    # shield: one caller being cancelled must not cancel the search for the others
+    return await asyncio.shield(search)
 
 
-async def fetch_device_and_app_logs(context: agents.RunContext, device_id: str, mock_log_guidance: dict | None) -> str:
+async def fetch_device_and_app_logs(context: "agents.RunContext", device_id: str, mock_log_guidance: dict | None) -> str:
     """Fetch device and application logs for diagnostics"""
     # Placeholder function - not used for outbound sales calls
     return "No device logs available for outbound calls"
@@ -113,10 +222,11 @@ def fetch_user_info(user_id: str) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=4096)
 def fetch_user_id_from_phone_number(user_phone_number) -> str:
-    return f"lead_{user_phone_number.replace('+', '').replace('-', '')}"
+    return f"lead_{normalize_phone_number(user_phone_number)}"
 
 
 def fetch_business_rules() -> str:
     """Fetch business rules and policies"""
-    return "Focus on scheduling appointments efficiently and professionally for Floor Covering International."
\ No newline at end of file
+    return _BUSINESS_RULES
\ No newline at end of file
@@ -1,12 +1,14 @@
-import json
+import re
+import orjson
 import asyncio
 import aiohttp
 from dataclasses import dataclass, field
-from typing import AsyncIterable, List, Dict
+from typing import AsyncIterable, Callable, List, Dict, Tuple
 from enum import StrEnum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from pydantic_core import from_json
 from livekit import agents, rtc
+from livekit.rtc.participant import PublishDataError
 
 from .common import logger, is_console_mode, get_timestamp_iso_berlin, MESSAGE_TYPE_REASONING_USER_RESPONSE, MESSAGE_TYPE_AGENT, MESSAGE_TYPE_USER, ROLE_ASSISTANT
 from .tracing import write_trace
@@ -37,6 +39,27 @@ class MySessionInfo:
     mock_log_guidance: dict | None = None
 
 
+@dataclass(slots=True)
+class CustomerInfo:
+    first_name: str = ""
+    last_name: str = ""
+    address: str = ""
+    project_info: str = ""
+
+
+def parse_customer_info(metadata: dict) -> CustomerInfo | None:
+    """Read the lead's customer_info block from dispatch metadata, or None if there is none"""
+    customer_info = metadata.get("customer_info")
+    if not customer_info or not isinstance(customer_info, dict):
+        return None
+    return CustomerInfo(
+        first_name=customer_info.get("first_name") or "",
+        last_name=customer_info.get("last_name") or "",
+        address=customer_info.get("address") or "",
+        project_info=customer_info.get("project_info") or "",
+    )
+
+
 class FrustrationLevel(StrEnum):
     low = 'low'
     medium = 'medium'
@@ -49,27 +72,172 @@ class ResponseFormat(BaseModel):
     response: str = Field(..., description="The assistant's response to the user.")
 
 
+_STRING_SPECIALS = re.compile(r'["\\]')
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+class ResponseFieldStream:
+    """
+    Incrementally extract the top-level "response" string from a JSON object as it streams in.
+
+    State is kept between chunks, so each character is scanned once; feed() returns only the
+    newly decoded part of the "response" value.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.after_colon = False       # at depth 1: between ':' and the next ','
+        self.in_string = False
+        self.string_is_key = False
+        self.emitting = False          # inside the "response" value
+        self.escape: str | None = None  # "" right after a backslash, "uXXX" while reading \u digits
+        self.high_surrogate: int | None = None
+        self.key_parts: List[str] = []
+        self.last_key = ""
+
+    def _text(self, text: str, out: List[str]):
+        if self.emitting:
+            out.append(text)
+        elif self.string_is_key:
+            self.key_parts.append(text)
+
+    def _escape_char(self, ch: str, out: List[str]) -> bool:
+        """Consume one character of an escape sequence; False if ch is not part of it"""
+        if self.escape == "":
+            if ch == "u":
+                self.escape = "u"
+                return True
+            self.escape = None
+            self.high_surrogate = None
+            self._text(_SIMPLE_ESCAPES.get(ch, ch), out)
+            return True
+
+        if ch not in _HEX_DIGITS:
+            # Malformed \u escape from the LLM: drop it and read ch as ordinary string content
+            self.escape = None
+            self.high_surrogate = None
+            return False
+
+        self.escape += ch
+        if len(self.escape) < 5:
+            return True
+        code = int(self.escape[1:], 16)
+        self.escape = None
+        if 0xD800 <= code < 0xDC00:
+            self.high_surrogate = code
+            return True
+        if 0xDC00 <= code < 0xE000 and self.high_surrogate is not None:
+            code = 0x10000 + ((self.high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self.high_surrogate = None
+        self._text(chr(code), out)
+        return True
+
+    def feed(self, chunk: str) -> str:
+        out: List[str] = []
+        i, n = 0, len(chunk)
+        while i < n:
+            if self.in_string:
+                if self.escape is not None:
+                    if self._escape_char(chunk[i], out):
+                        i += 1
+                    continue
+                # Copy the run up to the next quote or backslash in one slice
+                m = _STRING_SPECIALS.search(chunk, i)
+                end = m.start() if m else n
+                if end > i:
+                    # A high surrogate only pairs with a \u escape that follows it directly
+                    self.high_surrogate = None
+                    self._text(chunk[i:end], out)
+                i = end
+                if m:
+                    if chunk[i] == '"':
+                        self.in_string = False
+                        self.high_surrogate = None
+                        if self.string_is_key:
+                            self.last_key = "".join(self.key_parts)
+                        self.emitting = False
+                    else:
+                        self.escape = ""
+                    i += 1
+                continue
+
+            ch = chunk[i]
+            i += 1
+            if ch == '"':
+                self.in_string = True
+                self.string_is_key = self.depth == 1 and not self.after_colon
+                self.emitting = self.depth == 1 and self.after_colon and self.last_key == "response"
+                self.key_parts = []
+            elif ch in "{[":
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+            elif self.depth == 1 and ch == ":":
+                self.after_colon = True
+            elif self.depth == 1 and ch == ",":
+                self.after_colon = False
+        return "".join(out)
+
+
 async def process_structured_output(text_stream: AsyncIterable[str]) -> AsyncIterable[str]:
     """Process structured LLM output for TTS streaming"""
     logger.info(f"inside process_structured_output: {text_stream}")
 
-    last_response = ""
-    acc_text = ""
+    parser = ResponseFieldStream()
+    async for chunk in text_stream:
+        new_delta = parser.feed(chunk)
+        if new_delta:
+            yield new_delta
+
+
+# A sentence ends at a newline, or at ., ! or ? followed by whitespace, so "$3.50" is never
+# split; an abbreviation like "Dr.", "sq. ft." or "e.g." is not an ending either
+_SENTENCE_END = re.compile(r'(?<!\bMr)(?<!\bMs)(?<!\bDr)(?<!\bSt)(?<!\bMrs)(?<!\bsq)(?<!\bft)(?<!\be\.g)(?<!\bi\.e)[.!?](?=\s)|\n')
+_SENTENCE_LOOKBEHIND = 4  # characters of earlier text _SENTENCE_END may need to see
+
+
+async def split_sentences(text_stream: AsyncIterable[str], max_words: int = 25) -> AsyncIterable[str]:
+    """Re-chunk a text stream so each piece ends on a sentence boundary (or after max_words words)"""
+    parts: List[str] = []
+    spaces = 0
+    tail = ""  # last few characters before the current chunk
+    tail_open = False  # False while the text yielded so far ends exactly at the end of tail
 
     async for chunk in text_stream:
-        acc_text += chunk
-        try:
-            resp: ResponseFormat = from_json(acc_text, allow_partial="trailing-strings")
-        except ValueError:
+        if not chunk:
             continue
+        # Search from the last character before this chunk, since a terminator ending the
+        # previous chunk only becomes a sentence end once whitespace follows it
+        window = tail + chunk
+        last = None
+        for last in _SENTENCE_END.finditer(window, len(tail) - tail_open):
+            pass
+        tail = window[-_SENTENCE_LOOKBEHIND:]
+        tail_open = True
 
-        if not resp.get("response"):
+        if last is not None:
+            cut = last.end() - (len(window) - len(chunk))
+            parts.append(chunk[:cut])
+            yield "".join(parts)
+            rest = chunk[cut:]
+            parts = [rest] if rest else []
+            spaces = rest.count(" ")
+            tail_open = bool(rest)
             continue
 
-        new_delta = resp["response"][len(last_response) :]
-        if new_delta:
-            yield new_delta
-        last_response = resp["response"]
+        parts.append(chunk)
+        spaces += chunk.count(" ")
+        if spaces >= max_words:
+            buffer = "".join(parts)
+            cut = buffer.rfind(" ")
+            yield buffer[:cut + 1]
+            rest = buffer[cut + 1:]
+            parts = [rest] if rest else []
+            spaces = 0
+
+    if parts:
+        yield "".join(parts)
 
 
 async def notify_session_end(userdata: MySessionInfo, is_unit_test: bool = False):
@@ -79,71 +247,187 @@ async def notify_session_end(userdata: MySessionInfo, is_unit_test: bool = False
     # Just log the session end for monitoring purposes
 
 
+# UI triggers go out through one publisher task per room, in order, as one "ui_trigger"
+# message each: the only shape the frontend handles
+_ui_trigger_queues: Dict[rtc.Room, asyncio.Queue] = {}
+_ui_trigger_publishers: List[asyncio.Task] = []
+
+
+async def _publish_ui_triggers(room: rtc.Room, queue: asyncio.Queue):
+    """Send queued UI triggers for a room in order, one publish_data per trigger"""
+    while True:
+        message = await queue.get()
+        action = message["action"]
+        try:
+            await room.local_participant.publish_data(
+                orjson.dumps(message),  # already UTF-8 bytes
+                reliable=True
+            )
+            logger.info(f"📨 SUCCESS: Sent UI trigger via stored room: {action}")
+        except (PublishDataError, ConnectionError) as e:
+            logger.error(f"❌ Failed to send UI trigger ({action}): {e}")
+        except Exception as e:
+            # e.g. the room is not connected yet; the publisher must outlive any one trigger
+            logger.error(f"❌ Unexpected error sending UI trigger ({action}): {e}")
+        finally:
+            queue.task_done()
+
+
+def _get_ui_trigger_queue(room: rtc.Room) -> asyncio.Queue:
+    queue = _ui_trigger_queues.get(room)
+    if queue is None:
+        queue = _ui_trigger_queues[room] = asyncio.Queue()
+        task = asyncio.create_task(_publish_ui_triggers(room, queue))
+        task.set_name("ui_trigger_publisher")
+        _ui_trigger_publishers.append(task)
+    return queue
+
+
 async def send_ui_trigger(room: rtc.Room, action: str, data: dict = None):
-    """Send UI trigger to frontend using the room reference"""
-    try:
-        message = {
-            "type": "ui_trigger",
-            "action": action
-        }
-
-        # Add additional data if provided
-        if data:
-            message.update(data)
-
-        logger.info(f"📤 Attempting to send UI trigger: {action}")
-
-        await room.local_participant.publish_data(
-            json.dumps(message).encode('utf-8'),
-            reliable=True
-        )
+    """Queue a UI trigger for the frontend; a per-room publisher task sends it"""
+    message = {
+        "type": "ui_trigger",
+        "action": action
+    }
+
+    # Add additional data if provided
+    if data:
+        message.update(data)
+
+    logger.info(f"📤 Attempting to send UI trigger: {action}")
+    _get_ui_trigger_queue(room).put_nowait(message)
+
+
+async def _shutdown_ui_triggers():
+    """Give queued UI triggers a moment to go out, then stop the publishers"""
+    if _ui_trigger_queues:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in _ui_trigger_queues.values())),
+                timeout=2.0
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Timeout waiting for UI triggers to send during shutdown")
 
-        logger.info(f"📨 SUCCESS: Sent UI trigger via stored room: {action}")
-    except Exception as e:
-        logger.error(f"❌ Failed to send UI trigger: {e}")
+    for task in _ui_trigger_publishers:
+        task.cancel()
+    if _ui_trigger_publishers:
+        await asyncio.gather(*_ui_trigger_publishers, return_exceptions=True)
+
+    _ui_trigger_publishers.clear()
+    _ui_trigger_queues.clear()
 
 
 async def on_shutdown():
     """Generic shutdown function for cleanup tasks."""
     from .tracing import shutdown_trace_system
+    from .fetching import close_http_sessions
+    # Conversation items still queued at hangup are usually the last turns; trace them
+    # before the trace system goes away
+    await _shutdown_conversation_consumers()
+    await _shutdown_ui_triggers()
     await shutdown_trace_system()
+    await close_http_sessions()
+
+
+# Conversation items are processed in order by one consumer task per session. The queue is
+# unbounded: items arrive at conversation pace, and the event handler could only drop
+# turns from the trace if it were full.
+_conversation_consumers: List[Tuple[asyncio.Queue, asyncio.Task]] = []
+
+
+async def consume_conversation_items(queue: asyncio.Queue, session: agents.AgentSession):
+    """Process conversation_item_added events in arrival order on one long-lived task"""
+    while True:
+        event = await queue.get()
+        try:
+            await on_conversation_item_added(event, session)
+        except Exception as e:
+            logger.error(f"Error handling conversation item: {e}")
+        finally:
+            queue.task_done()
+
+
+def start_conversation_consumer(session: agents.AgentSession) -> Callable[[agents.ConversationItemAddedEvent], None]:
+    """Start the session's conversation item consumer and return the event handler that feeds it"""
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(consume_conversation_items(queue, session))
+    task.set_name("conversation_item_consumer")
+    _conversation_consumers.append((queue, task))
+    return queue.put_nowait
+
+
+async def _shutdown_conversation_consumers():
+    """Let queued conversation items be processed, then stop the consumers"""
+    if _conversation_consumers:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue, _ in _conversation_consumers)),
+                timeout=5.0
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Timeout waiting for conversation items to be processed during shutdown")
+
+    for _, task in _conversation_consumers:
+        task.cancel()
+    if _conversation_consumers:
+        await asyncio.gather(*(task for _, task in _conversation_consumers), return_exceptions=True)
+
+    _conversation_consumers.clear()
+
+
+# Trace message type per chat role; every other role is traced as the user
+_ROLE_TO_MESSAGE_TYPE = {ROLE_ASSISTANT: MESSAGE_TYPE_AGENT}
 
 
 async def on_conversation_item_added(event: agents.ConversationItemAddedEvent, session: agents.AgentSession):
     """Handle conversation item added events for tracing"""
-    logger.info(f"on_conversation_item_added: {event}")
+    if not session.userdata.consent_to_record:
+        return
 
-    if session.userdata.consent_to_record:
-        content = event.item.text_content
+    item = event.item
+    logger.info("on_conversation_item_added: type=%s role=%s", getattr(item, "type", "-"), getattr(item, "role", "-"))
 
-        if event.item.role == ROLE_ASSISTANT:  # write reasoning
+    # The reasoning and message traces describe the same moment; format it once
+    occurred_at = get_timestamp_iso_berlin()
+    content = item.text_content
+    message_type = _ROLE_TO_MESSAGE_TYPE.get(item.role, MESSAGE_TYPE_USER)
+
+    if message_type == MESSAGE_TYPE_AGENT:  # write reasoning
+        try:
             try:
-                assistant_response = ResponseFormat(**from_json(content, allow_partial="trailing-strings"))
-                reasoning = assistant_response.model_dump(exclude={"response"})
-                content = assistant_response.response
-            except Exception as e:
-                logger.error(f"Failed to parse assistant response format: {e}")
-                logger.error(f"Raw content: {content}")
-                # Create fallback response with default values
-                assistant_response = ResponseFormat(
-                    user_frustration_level=FrustrationLevel.medium,
-                    number_of_attempts=-1,
-                    response="Can you say that again, please?"
-                )
-                reasoning = assistant_response.model_dump(exclude={"response"})
-                content = assistant_response.response
-            await write_trace(
-                occurred_at=get_timestamp_iso_berlin(),
-                conversation_id=session.userdata.conversation_id,
-                message_type=MESSAGE_TYPE_REASONING_USER_RESPONSE,
-                message=reasoning,
+                # Complete replies: single-pass parse and validate
+                assistant_response = ResponseFormat.model_validate_json(content)
+            except ValidationError:
+                # Interrupted replies end mid-string; accept the partial JSON
+                assistant_response = ResponseFormat.model_validate(from_json(content, allow_partial="trailing-strings"))
+            reasoning = {
+                "user_frustration_level": assistant_response.user_frustration_level,
+                "number_of_attempts": assistant_response.number_of_attempts,
+            }
+            content = assistant_response.response
+        except Exception as e:
+            logger.error(f"Failed to parse assistant response format: {e}")
+            logger.error(f"Raw content: {content}")
+            # Create fallback response with default values
+            assistant_response = ResponseFormat(
+                user_frustration_level=FrustrationLevel.medium,
+                number_of_attempts=-1,
+                response="Can you say that again, please?"
             )
-
-        message_type = MESSAGE_TYPE_AGENT if event.item.role == ROLE_ASSISTANT else MESSAGE_TYPE_USER
+            reasoning = assistant_response.model_dump(exclude={"response"})
+            content = assistant_response.response
         await write_trace(
-            occurred_at=get_timestamp_iso_berlin(),
+            occurred_at=occurred_at,
             conversation_id=session.userdata.conversation_id,
-            message_type=message_type,
-            message={"text": content},
-            should_redact=True
-        )
\ No newline at end of file
+            message_type=MESSAGE_TYPE_REASONING_USER_RESPONSE,
+            message=reasoning,
+        )
+
+    await write_trace(
+        occurred_at=occurred_at,
+        conversation_id=session.userdata.conversation_id,
+        message_type=message_type,
+        message={"text": content},
+        should_redact=True
+    )
\ No newline at end of file
@@ -6,14 +6,155 @@ from typing import List
 from livekit import agents
 from livekit.plugins import openai
 
-from .common import logger, is_console_mode, MESSAGE_TYPE_USER, MESSAGE_TYPE_AGENT
+from .common import logger, is_console_mode, MESSAGE_TYPE_USER, MESSAGE_TYPE_AGENT, MESSAGE_TYPE_REASONING_USER_RESPONSE
+
+
+class RingQueue:
+    """
+    Bounded FIFO over a preallocated ring buffer, for one event loop with any number of consumers.
+
+    Unlike asyncio.Queue, put_nowait allocates no Future per item: consumers park on a single
+    Event that is set once per idle->busy transition, and drain everything queued before
+    waiting again. A full queue rejects the item so the producer can drop it.
+    """
+
+    def __init__(self, capacity: int = 4096, not_empty: asyncio.Event = None):
+        if capacity & (capacity - 1):
+            raise ValueError("RingQueue capacity must be a power of two")
+        self._buf: List = [None] * capacity
+        self._mask = capacity - 1
+        self._capacity = capacity
+        self._head = 0
+        self._tail = 0
+        # Several rings may share one Event so a consumer can wait on all of them
+        self._not_empty = not_empty or asyncio.Event()
+        self._unfinished = 0
+        self._all_done = asyncio.Event()
+        self._all_done.set()
+
+    def qsize(self) -> int:
+        return self._tail - self._head
+
+    def full(self) -> bool:
+        return self._tail - self._head >= self._capacity
+
+    def put_nowait(self, item) -> bool:
+        if self._tail - self._head >= self._capacity:
+            return False
+        self._buf[self._tail & self._mask] = item
+        self._tail += 1
+        self._unfinished += 1
+        self._all_done.clear()
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+        return True
+
+    async def get(self):
+        while self._head == self._tail:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        slot = self._head & self._mask
+        item = self._buf[slot]
+        self._buf[slot] = None
+        self._head += 1
+        return item
+
+    async def get_batch(self, max_items: int) -> List:
+        """Wait for at least one item, then take up to max_items that are already queued."""
+        while self._head == self._tail:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.take(max_items)
+
+    def take(self, max_items: int) -> List:
+        """Take up to max_items that are already queued, without waiting."""
+        count = min(max_items, self._tail - self._head)
+        batch = []
+        for _ in range(count):
+            slot = self._head & self._mask
+            batch.append(self._buf[slot])
+            self._buf[slot] = None
+            self._head += 1
+        return batch
+
+    def drop_oldest(self):
+        """Discard and return the oldest queued item (None if empty); it counts as done."""
+        if self._head == self._tail:
+            return None
+        slot = self._head & self._mask
+        item = self._buf[slot]
+        self._buf[slot] = None
+        self._head += 1
+        self.task_done()
+        return item
+
+    def task_done(self, count: int = 1):
+        self._unfinished -= count
+        if self._unfinished <= 0:
+            self._unfinished = 0
+            self._all_done.set()
+
+    async def join(self):
+        await self._all_done.wait()
+
+
+# Reasoning dumps are large and can be shed under load; everything else is latency-sensitive
+BULK_MESSAGE_TYPES = frozenset({MESSAGE_TYPE_REASONING_USER_RESPONSE})
+
+
+class TraceQueue:
+    """
+    Two-level trace queue: consumers always drain the hot ring (user/agent/tool traces)
+    before the bulk ring (reasoning dumps). A full hot ring rejects the new item; a full
+    bulk ring drops its oldest item to make room.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._not_empty = asyncio.Event()
+        self.hot = RingQueue(capacity, not_empty=self._not_empty)
+        self.bulk = RingQueue(capacity, not_empty=self._not_empty)
+
+    def qsize(self) -> int:
+        return self.hot.qsize() + self.bulk.qsize()
+
+    def put_nowait(self, item) -> bool:
+        """Queue a hot item; returns False if the hot ring is full."""
+        return self.hot.put_nowait(item)
+
+    def put_bulk(self, item):
+        """Queue a bulk item, returning the oldest bulk item if it had to be dropped."""
+        dropped = self.bulk.drop_oldest() if self.bulk.full() else None
+        self.bulk.put_nowait(item)
+        return dropped
+
+    async def get_batch(self, max_items: int) -> List:
+        """Wait for any item, then take up to max_items, hot items first."""
+        while not self.hot.qsize() and not self.bulk.qsize():
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        batch = self.hot.take(max_items)
+        if len(batch) < max_items:
+            batch.extend(self.bulk.take(max_items - len(batch)))
+        return batch
+
+    def task_done(self, batch: List):
+        bulk_count = sum(1 for item in batch if item.message_type in BULK_MESSAGE_TYPES)
+        self.bulk.task_done(bulk_count)
+        self.hot.task_done(len(batch) - bulk_count)
+
+    async def join(self):
+        await asyncio.gather(self.hot.join(), self.bulk.join())
 
 
 # Global trace system infrastructure
-trace_queue: asyncio.Queue = None
+trace_queue: TraceQueue = None
 trace_session: aiohttp.ClientSession = None
 trace_consumers: List[asyncio.Task] = []
+dropped_traces = 0  # traces shed because the queue was full, for observability
 N_WRITE_TRACE_CONSUMERS = 5
+TRACE_QUEUE_CAPACITY = 4096
+TRACE_BATCH_SIZE = 128
+REDACTED_MESSAGE_TYPES = frozenset({MESSAGE_TYPE_USER, MESSAGE_TYPE_AGENT})
 
 
 @dataclass
@@ -34,7 +175,7 @@ async def write_trace(
     """
     Add a trace item to the queue for background processing.
     """
-    global trace_queue
+    global trace_queue, dropped_traces
     
     if trace_queue is None:
         logger.error("Trace system not initialized. Call init_trace_system() first.")
@@ -50,57 +191,71 @@ async def write_trace(
         trace_id=trace_id
     )
     
-    try:
-        await trace_queue.put(item)
-    except asyncio.QueueFull:
+    if message_type in BULK_MESSAGE_TYPES:
+        dropped = trace_queue.put_bulk(item)
+        if dropped is not None:
+            dropped_traces += 1
+            logger.warning(f"Trace queue is full, dropping oldest trace: {dropped.conversation_id}, {dropped.message_type}")
+    elif not trace_queue.put_nowait(item):
+        dropped_traces += 1
         logger.error(f"Trace queue is full, dropping trace: {conversation_id}, {message_type}")
-    except Exception as e:
-        logger.error(f"Error adding trace to queue: {str(e)}")
+
+
+_REDACT_SYSTEM_PROMPT = textwrap.dedent("""
+    Redact any personally identifiable information (PII) from the given text, replacing each PII token with a clear, bracketed label indicating its type (e.g., [Address], [Credit card], [Phone number], [Email], [Social Security Number], etc.). Ensure all forms of PII are identified and properly replaced. If multiple PII types appear, apply the relevant label for each. Reason step-by-step to identify and classify each PII instance before producing the redacted output. Persist until all objectives are met and the output text contains no remaining PII.
+    
+    Output Format:
+    - Return the fully redacted text as a single string, with every PII instance replaced by its type in square brackets.
+    
+    Example:
+    Input: "John Doe lives at 123 Main St., Springfield. His phone number is 555-123-4567 and his email is johndoe@email.com."
+    Reasoning:  
+    - Detect "John Doe" as a name → [Name]  
+    - "123 Main St., Springfield" as an address → [Address]  
+    - "555-123-4567" as a phone number → [Phone number]  
+    - "johndoe@email.com" as an email → [Email]
+    Output: "[Name] lives at [Address]. His phone number is [Phone number] and his email is [Email]."
+    
+    (For longer inputs, ensure every PII token is handled. Use clear placeholders based on PII type in every instance.)
+    
+    Important:  
+    - Step-by-step reasoning to detect and classify PII before returning the redacted text.  
+    - Output ONLY the single redacted text, no extra commentary or metadata.
+    
+    Important instructions and objective reminder:  
+    Redact all PII in the text by replacing tokens with clearly bracketed PII-type labels; include every PII kind and reason step-by-step before final output. 
+    
+    Note: Don't output Reasoning. Only output the fully redacted string.
+""").strip()
+
+# Built on first use rather than at import, so importing tracing has no client side effects
+_redact_llm: openai.LLM = None
+
+
+def _get_redact_llm() -> openai.LLM:
+    global _redact_llm
+    if _redact_llm is None:
+        _redact_llm = openai.LLM(model="gpt-4.1-mini")
+    return _redact_llm
 
 
 async def redact(text_content: str):
     """Redact personally identifiable information from text content"""
     logger.info(f"Inside redact. Text content: {text_content}")
 
-    system_prompt = textwrap.dedent("""
-        Redact any personally identifiable information (PII) from the given text, replacing each PII token with a clear, bracketed label indicating its type (e.g., [Address], [Credit card], [Phone number], [Email], [Social Security Number], etc.). Ensure all forms of PII are identified and properly replaced. If multiple PII types appear, apply the relevant label for each. Reason step-by-step to identify and classify each PII instance before producing the redacted output. Persist until all objectives are met and the output text contains no remaining PII.
-        
-        Output Format:
-        - Return the fully redacted text as a single string, with every PII instance replaced by its type in square brackets.
-        
-        Example:
-        Input: "John Doe lives at 123 Main St., Springfield. His phone number is 555-123-4567 and his email is johndoe@email.com."
-        Reasoning:  
-        - Detect "John Doe" as a name → [Name]  
-        - "123 Main St., Springfield" as an address → [Address]  
-        - "555-123-4567" as a phone number → [Phone number]  
-        - "johndoe@email.com" as an email → [Email]
-        Output: "[Name] lives at [Address]. His phone number is [Phone number] and his email is [Email]."
-        
-        (For longer inputs, ensure every PII token is handled. Use clear placeholders based on PII type in every instance.)
-        
-        Important:  
-        - Step-by-step reasoning to detect and classify PII before returning the redacted text.  
-        - Output ONLY the single redacted text, no extra commentary or metadata.
-        
-        Important instructions and objective reminder:  
-        Redact all PII in the text by replacing tokens with clearly bracketed PII-type labels; include every PII kind and reason step-by-step before final output. 
-        
-        Note: Don't output Reasoning. Only output the fully redacted string.
-    """)
-
     chat_ctx = agents.ChatContext([
         agents.ChatMessage(
             type="message",
             role="system",
-            content=[system_prompt]
+            content=[_REDACT_SYSTEM_PROMPT]
         ),
         agents.ChatMessage(type="message", role="user", content=[f"""Redact this text: \n\n{text_content}"""])
     ])
 
-    llm = openai.LLM(model="gpt-4.1-mini")
+    llm = _get_redact_llm()
 
-    response = ""
+    # Collect streamed chunks and join once; += would recopy the whole response per chunk
+    response_parts: List[str] = []
     try:
         async with llm.chat(chat_ctx=chat_ctx) as stream:
             async for chunk in stream:
@@ -108,54 +263,73 @@ async def redact(text_content: str):
                     continue
                 content = getattr(chunk.delta, 'content', None) if hasattr(chunk, 'delta') else str(chunk)
                 if content:
-                    response += content
+                    response_parts.append(content)
+        response = "".join(response_parts)
         logger.info(f"Redacted: {response}")
 
     except Exception as e:
         logger.error(f"Error inside redaction: {str(e)}")
+        response = "".join(response_parts)
 
     return response
 
 
-async def trace_consumer():
-    """Consumer function that processes trace items from the queue."""
+def _prepare_trace(item: TraceItem) -> TraceItem:
+    """Apply per-item trace processing before the item is written."""
+    content = item.message
+    if item.should_redact and item.message_type in REDACTED_MESSAGE_TYPES:
+        try:
+            # Redact text content
+            # content["text"] = await redact(content["text"])
+            content["text"] = content["text"]  # no redaction for now
+        except Exception as e:
+            logger.error(f"Failed to redact: {str(e)}")
+    return item
+
+
+async def write_trace_batch(items: List[TraceItem]):
+    """Write a batch of traces in one go."""
+    # For outbound sales calls, just log the traces locally, one record per batch
+    logger.info("\n".join(f"Trace: {item.conversation_id} | {item.message_type} | {item.occurred_at}" for item in items))
+
+
+async def trace_consumer(console_mode: bool = False):
+    """
+    Consumer function that processes trace items from the queue in batches.
+
+    In console mode only unit-test traces are written (write_trace itself is being
+    tested); everything else is drained and skipped.
+    """
     global trace_queue, trace_session
     
     while True:
         try:
-            # Get trace item from queue
-            item: TraceItem = await trace_queue.get()
-            
-            # Skip tracing in console mode
-            if item.is_unit_test:
-                pass  # if testing write_trace, continue, since write_trace is being tested
-            else:
-                if is_console_mode():  # if console mode, then skip writing trace
-                    logger.info(f"Skipping trace in console mode: {item.conversation_id}, {item.message_type}")
-                    trace_queue.task_done()
-                    continue
+            # Take whatever is queued (up to TRACE_BATCH_SIZE) in one wakeup
+            batch: List[TraceItem] = await trace_queue.get_batch(TRACE_BATCH_SIZE)
+        except asyncio.CancelledError:
+            logger.info("Trace consumer cancelled")
+            break
 
-            content = item.message
-            if item.should_redact and item.message_type in {MESSAGE_TYPE_USER, MESSAGE_TYPE_AGENT}:
-                try:
-                    # Redact text content
-                    # content["text"] = await redact(content["text"])
-                    content["text"] = content["text"]  # no redaction for now
-                except Exception as e:
-                    logger.error(f"Failed to redact: {str(e)}")
-
-            # For outbound sales calls, just log the trace locally
-            logger.info(f"Trace: {item.conversation_id} | {item.message_type} | {item.occurred_at}")
-            
-            # Mark task as done
-            trace_queue.task_done()
-            
+        try:
+            if console_mode:
+                items = [item for item in batch if item.is_unit_test]
+                skipped = len(batch) - len(items)
+                if skipped:
+                    logger.info(f"Skipping {skipped} trace(s) in console mode")
+            else:
+                items = batch
+            items = [_prepare_trace(item) for item in items]
+            if items:
+                await write_trace_batch(items)
         except asyncio.CancelledError:
             logger.info("Trace consumer cancelled")
             break
         except Exception as e:
             logger.error(f"Unexpected error in trace_consumer: {str(e)}")
             # Continue running even if there's an error
+        finally:
+            # Mark the whole batch as done
+            trace_queue.task_done(batch)
 
 
 async def init_trace_system():
@@ -163,7 +337,7 @@ async def init_trace_system():
     global trace_queue, trace_session, trace_consumers
     
     # Create queue
-    trace_queue = asyncio.Queue(maxsize=100)
+    trace_queue = TraceQueue(capacity=TRACE_QUEUE_CAPACITY)
     
     # Create shared HTTP session with proper configuration
     connector = aiohttp.TCPConnector(limit=10, limit_per_host=5)
@@ -173,10 +347,13 @@ async def init_trace_system():
         timeout=timeout
     )
     
+    # Console mode is fixed for the process lifetime, so decide it once here
+    console_mode = is_console_mode()
+
     # Start consumer tasks
     trace_consumers = []
     for i in range(N_WRITE_TRACE_CONSUMERS):
-        task = asyncio.create_task(trace_consumer())
+        task = asyncio.create_task(trace_consumer(console_mode))
         task.set_name(f"trace_consumer_{i}")
         trace_consumers.append(task)
     
@@ -209,6 +386,9 @@ async def shutdown_trace_system():
     if trace_session:
         await trace_session.close()
     
+    if dropped_traces:
+        logger.warning(f"Dropped {dropped_traces} trace(s) because the trace queue was full")
+
     # Reset globals
     trace_consumers.clear()
     trace_queue = None
@@ -78,5 +78,9 @@ echo ""
 echo "🧪 To test the API, run: python test_api.py"
 echo ""
 
-# Start the web service
-python web_service.py
\ No newline at end of file
+# Start the web service: the Flask dev server for development, gunicorn otherwise
+if [ "$FLASK_ENV" = "development" ]; then
+    python web_service.py
+else
+    exec gunicorn --bind 0.0.0.0:$PORT --worker-class gthread --workers ${WEB_CONCURRENCY:-2} --threads 8 web_service:app
+fi
\ No newline at end of file
@@ -17,13 +17,17 @@ load_dotenv()
 BASE_URL = "http://localhost:5000"
 API_KEY = os.getenv("API_KEY", "secure-api-key-change-this-in-production")
 
+# One keep-alive session shared by all tests instead of a new connection per request
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+
 
 def test_health_check():
     """Test the health check endpoint."""
     print("🏥 Testing health check endpoint...")
 
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         print(f"Status Code: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
         return response.status_code == 200
@@ -36,10 +40,7 @@ def test_dispatch_call():
     """Test the dispatch call endpoint."""
     print("\n📞 Testing dispatch call endpoint...")
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
+    headers = {"X-API-Key": API_KEY}
 
     # Test data
     test_data = {
@@ -50,7 +51,7 @@ def test_dispatch_call():
     }
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/v1/dispatch-call",
             json=test_data,
             headers=headers
@@ -66,14 +67,50 @@ def test_dispatch_call():
         return False
 
 
+def test_batch_dispatch():
+    """Test the batch dispatch endpoint with one valid and one invalid call."""
+    print("\n📞 Testing batch dispatch endpoint...")
+
+    headers = {"X-API-Key": API_KEY}
+
+    test_data = [
+        {
+            "first_name": "John",
+            "last_name": "TestCustomer",
+            "phone_number": "2125551234"
+        },
+        {
+            "first_name": "Jane",
+            "last_name": "TestCustomer",
+            "phone_number": "555123456789"  # Invalid format
+        }
+    ]
+
+    try:
+        response = SESSION.post(
+            f"{BASE_URL}/api/v1/dispatch-calls",
+            json=test_data,
+            headers=headers
+        )
+
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+
+        results = response.json().get("results", [])
+        return (response.status_code == 200
+                and len(results) == 2
+                and results[1].get("error") == "Invalid phone number")
+
+    except Exception as e:
+        print(f"❌ Batch dispatch test failed: {e}")
+        return False
+
+
 def test_invalid_api_key():
     """Test with invalid API key."""
     print("\n🔐 Testing invalid API key...")
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": "invalid-key"
-    }
+    headers = {"X-API-Key": "invalid-key"}
 
     test_data = {
         "first_name": "John",
@@ -82,7 +119,7 @@ def test_invalid_api_key():
     }
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/v1/dispatch-call",
             json=test_data,
             headers=headers
@@ -102,10 +139,7 @@ def test_invalid_phone():
     """Test with invalid phone number."""
     print("\n📞 Testing invalid phone number...")
 
-    headers = {
-        "Content-Type": "application/json",
-        "X-API-Key": API_KEY
-    }
+    headers = {"X-API-Key": API_KEY}
 
     test_data = {
         "first_name": "John",
@@ -114,7 +148,7 @@ def test_invalid_phone():
     }
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/v1/dispatch-call",
             json=test_data,
             headers=headers
@@ -130,6 +164,35 @@ def test_invalid_phone():
         return False
 
 
+def test_blank_phone():
+    """Test that a whitespace-only phone number is reported as an invalid phone number."""
+    print("\n📞 Testing whitespace-only phone number...")
+
+    headers = {"X-API-Key": API_KEY}
+
+    test_data = {
+        "first_name": "John",
+        "last_name": "TestCustomer",
+        "phone_number": "   "
+    }
+
+    try:
+        response = SESSION.post(
+            f"{BASE_URL}/api/v1/dispatch-call",
+            json=test_data,
+            headers=headers
+        )
+
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+
+        return response.status_code == 400 and response.json().get("error") == "Invalid phone number"
+
+    except Exception as e:
+        print(f"❌ Blank phone test failed: {e}")
+        return False
+
+
 def main():
     """Run all tests."""
     print("🧪 Starting API Tests")
@@ -137,7 +200,7 @@ def main():
 
     # Check if service is running
     try:
-        requests.get(f"{BASE_URL}/health", timeout=5)
+        SESSION.get(f"{BASE_URL}/health", timeout=5)
     except Exception:
         print("❌ Service is not running. Please start the web service first:")
         print("   python web_service.py")
@@ -146,8 +209,10 @@ def main():
     tests = [
         ("Health Check", test_health_check),
         ("Dispatch Call", test_dispatch_call),
+        ("Batch Dispatch", test_batch_dispatch),
         ("Invalid API Key", test_invalid_api_key),
-        ("Invalid Phone", test_invalid_phone)
+        ("Invalid Phone", test_invalid_phone),
+        ("Blank Phone", test_blank_phone)
     ]
 
     results = []
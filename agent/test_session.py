@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming structured-output parser
+
+Feeds JSON-encoded LLM responses to ResponseFieldStream in random chunks and checks that the
+decoded "response" text matches json.loads.
+"""
+
+import os
+import sys
+import json
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from utils.session import ResponseFieldStream
+
+SAMPLES = [
+    "Hi, this is Jack from Floor Covering International.",
+    "Line one\nLine two\t\"quoted\" and a back\\slash / slash",
+    "Prices start at $3.50 per sq. ft. — see you Tuesday! 🏠👍",
+    "Über café naïve 日本語 \u0007 \u001f",
+    "",
+]
+
+
+def split_randomly(text: str, rng: random.Random):
+    """Cut text into chunks of 1-8 characters, like a token stream"""
+    i = 0
+    while i < len(text):
+        step = rng.randint(1, 8)
+        yield text[i:i + step]
+        i += step
+
+
+def feed_all(chunks) -> str:
+    parser = ResponseFieldStream()
+    return "".join(parser.feed(chunk) for chunk in chunks)
+
+
+def test_random_splits():
+    """Decoded response matches json.loads for randomly split payloads."""
+    print("🧩 Testing randomly split payloads...")
+
+    rng = random.Random(1234)
+    for response in SAMPLES:
+        for ensure_ascii in (True, False):
+            payload = json.dumps({
+                "user_frustration_level": "low",
+                "notes": {"response": "nested, not spoken"},
+                "number_of_attempts": 1,
+                "response": response,
+            }, ensure_ascii=ensure_ascii)
+            expected = json.loads(payload)["response"]
+            for _ in range(200):
+                decoded = feed_all(split_randomly(payload, rng))
+                if decoded != expected:
+                    print(f"❌ {payload!r}: got {decoded!r}, expected {expected!r}")
+                    return False
+    return True
+
+
+def test_malformed_escapes():
+    """Malformed \\u escapes and stray surrogates are dropped instead of raising."""
+    print("\n🧩 Testing malformed escapes...")
+
+    cases = {
+        '{"response": "a\\uZZ12b"}': "aZZ12b",
+        '{"response": "a\\u12"}': "a",
+        '{"response": "\\ud83dx\\udc4d"}': "x\udc4d",
+        '{"response": "\\ud83d\\n\\udc4d"}': "\n\udc4d",
+        '{"response": "\\ud83d\\udc4d"}': "👍",
+    }
+    for payload, expected in cases.items():
+        try:
+            decoded = feed_all(payload)
+        except ValueError as e:
+            print(f"❌ {payload!r} raised {e!r}")
+            return False
+        if decoded != expected:
+            print(f"❌ {payload!r}: got {decoded!r}, expected {expected!r}")
+            return False
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("🧪 Starting ResponseFieldStream Tests")
+    print("=" * 50)
+
+    tests = [
+        ("Random Splits", test_random_splits),
+        ("Malformed Escapes", test_malformed_escapes),
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        result = test_func()
+        results.append((test_name, result))
+        print(f"{'✅' if result else '❌'} {test_name}: {'PASSED' if result else 'FAILED'}")
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    print(f"Passed: {passed}/{len(results)}")
+    sys.exit(0 if passed == len(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,14 +7,28 @@ for integration with Zapier workflows and other automation tools.
 """
 
 import os
-import json
+import hmac
+import time
+import secrets
+import itertools
+import orjson
 import logging
-from typing import Dict, Any, Optional
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+import aiohttp
+from typing import Dict, Any, List, Optional, Tuple, Union
 from functools import wraps
 from datetime import datetime
 
 from flask import Flask, request, jsonify, Response
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from livekit.api import LiveKitAPI, TwirpError
+from livekit.protocol.room import CreateRoomRequest
+from livekit.protocol.agent_dispatch import CreateAgentDispatchRequest
 
 # Import existing dispatch functionality
 from dispatch_call import validate_phone_number, create_dispatch_command
@@ -26,48 +40,201 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify and request.get_json()."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Configuration
 API_KEY = os.getenv("API_KEY", "your-secure-api-key-here")
+_API_KEY_BYTES = API_KEY.encode()
 TEST_ADDRESS = os.getenv("TEST_ADDRESS", "123 Oak Street, Springfield, IL 62701")
+AGENT_NAME = os.getenv("AGENT_NAME", "outbound_call_agent")
+LIVEKIT_URL = os.getenv("LIVEKIT_URL")
+LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY")
+LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET")
+DISPATCH_TIMEOUT = 30  # seconds
+MAX_BATCH_CALLS = 32
+MAX_PHONE_CHARS = 32  # longer phone_number values are rejected without parsing
+
+# Lead ID suffix counter; next() on itertools.count is atomic across request threads, and the
+# random start keeps separate gunicorn workers from counting in lockstep
+_LEAD_COUNTER = itertools.count(secrets.randbelow(1000000))
+
+# The body limit is derived from DispatchCallRequest's field limits (names 50 characters).
+# json.dumps, and so requests.post(json=...), escapes every non-ASCII character as \uXXXX,
+# i.e. 6 bytes; the envelope covers the keys, the phone number and the address. A batch
+# carries up to MAX_BATCH_CALLS payloads.
+_JSON_ESCAPED_CHAR_BYTES = 6
+_BODY_ENVELOPE_BYTES = 4 * 1024
+MAX_CALL_BODY_BYTES = (50 + 50) * _JSON_ESCAPED_CHAR_BYTES + _BODY_ENVELOPE_BYTES
+MAX_BATCH_BODY_BYTES = MAX_BATCH_CALLS * MAX_CALL_BODY_BYTES
+# One byte over the largest route limit, so a chunked body that Flask cuts off at this
+# size still reads as oversized instead of as truncated JSON
+app.config['MAX_CONTENT_LENGTH'] = MAX_BATCH_BODY_BYTES + 1
+
+# Dispatch metadata fields that are the same for every call
+_METADATA_TEMPLATE = {
+    "call_type": "sales_outbound",
+    "agent_name": "Jack",
+    "initiated_via": "web_api"
+}
+# The template pre-encoded as an open JSON object; per-call fields are appended to it
+_METADATA_PREFIX = orjson.dumps(_METADATA_TEMPLATE)[:-1] + b","
+
+# Static error responses, encoded once at import. Each request wraps the shared bytes in
+# a fresh Response, since after_request hooks may modify the response they are given.
+_ERR_BAD_API_KEY = (orjson.dumps({'success': False, 'error': 'Invalid or missing API key', 'message': 'Please provide a valid X-API-Key header'}), 401)
+_ERR_CONFIG = (orjson.dumps({'success': False, 'error': 'Configuration error', 'message': 'LiveKit credentials not configured'}), 500)
+_ERR_NOT_JSON = (orjson.dumps({'success': False, 'error': 'Content-Type must be application/json'}), 400)
+_ERR_INVALID_JSON = (orjson.dumps({'success': False, 'error': 'Validation error', 'message': 'Request body must be valid JSON'}), 400)
+_ERR_DISPATCH_INTERNAL = (orjson.dumps({'success': False, 'error': 'Internal server error', 'message': 'An unexpected error occurred while processing the request'}), 500)
+_ERR_EMPTY_BATCH = (orjson.dumps({'success': False, 'error': 'Validation error', 'message': 'Expected a non-empty list of calls'}), 400)
+_ERR_BATCH_TOO_LARGE = (orjson.dumps({'success': False, 'error': 'Validation error', 'message': f'At most {MAX_BATCH_CALLS} calls can be dispatched per request'}), 400)
+_ERR_NOT_FOUND = (orjson.dumps({'success': False, 'error': 'Not found', 'message': 'The requested endpoint does not exist'}), 404)
+_ERR_TOO_LARGE = (orjson.dumps({'success': False, 'error': 'Payload too large', 'message': f'Request body must be at most {MAX_BATCH_BODY_BYTES} bytes'}), 413)
+_ERR_CALL_TOO_LARGE = (orjson.dumps({'success': False, 'error': 'Payload too large', 'message': f'Request body must be at most {MAX_CALL_BODY_BYTES} bytes'}), 413)
+_ERR_INTERNAL = (orjson.dumps({'success': False, 'error': 'Internal server error', 'message': 'An unexpected error occurred'}), 500)
+
+
+def static_error(error):
+    """Build a JSON error response from a precomputed (body, status) pair."""
+    body, status = error
+    return Response(body, status=status, mimetype='application/json')
+
+
+# One event loop per worker process, run on a daemon thread, that all LiveKit calls are
+# submitted to. Started lazily so that each forked gunicorn worker gets its own thread.
+_dispatch_loop: Optional[asyncio.AbstractEventLoop] = None
+_dispatch_loop_lock = threading.Lock()
+
+# LiveKit client shared by all dispatches in this worker. It is only ever touched from
+# the dispatch loop, which is also where its aiohttp session has to be created.
+_livekit_client: Optional[LiveKitAPI] = None
+
+
+def get_dispatch_loop() -> asyncio.AbstractEventLoop:
+    """Return the background dispatch loop, starting it on first use."""
+    global _dispatch_loop
+    if _dispatch_loop is None:
+        with _dispatch_loop_lock:
+            if _dispatch_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="livekit-dispatch-loop", daemon=True).start()
+                atexit.register(loop.call_soon_threadsafe, loop.stop)
+                # atexit runs in reverse order: close the client before stopping the loop
+                atexit.register(_close_livekit_client, loop)
+                _dispatch_loop = loop
+    return _dispatch_loop
+
+
+def get_livekit_client() -> LiveKitAPI:
+    """Return the shared LiveKit client, creating it on first use. Call from the dispatch loop."""
+    global _livekit_client
+    if _livekit_client is None:
+        _livekit_client = LiveKitAPI(LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET)
+    return _livekit_client
+
+
+def _close_livekit_client(loop: asyncio.AbstractEventLoop):
+    """Close the shared LiveKit client on the dispatch loop at worker exit."""
+    async def close():
+        global _livekit_client
+        if _livekit_client is not None:
+            await _livekit_client.aclose()
+            _livekit_client = None
+
+    try:
+        asyncio.run_coroutine_threadsafe(close(), loop).result(timeout=5)
+    except Exception as e:
+        logger.warning("Failed to close LiveKit API client: %s", e)
 
 
 def require_api_key(f):
     """Decorator to require API key authentication."""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        api_key = request.headers.get('X-API-Key')
-        if not api_key or api_key != API_KEY:
-            return jsonify({
-                'success': False,
-                'error': 'Invalid or missing API key',
-                'message': 'Please provide a valid X-API-Key header'
-            }), 401
+        # WSGI exposes the header as a latin-1 str; compare bytes in constant time
+        api_key = request.environ.get('HTTP_X_API_KEY')
+        if not api_key or not hmac.compare_digest(api_key.encode('latin-1'), _API_KEY_BYTES):
+            return static_error(_ERR_BAD_API_KEY)
         return f(*args, **kwargs)
     return decorated_function
 
 
-def validate_request_data(data: Dict[str, Any]) -> Optional[str]:
-    """Validate incoming request data."""
-    required_fields = ['first_name', 'last_name', 'phone_number']
-
-    for field in required_fields:
-        if not data.get(field):
-            return f"Missing required field: {field}"
-
-    # Additional validation
-    first_name = data.get('first_name', '').strip()
-    last_name = data.get('last_name', '').strip()
-
-    if len(first_name) < 1 or len(last_name) < 1:
-        return "First name and last name must be at least 1 character"
-
-    if len(first_name) > 50 or len(last_name) > 50:
-        return "Names must be less than 50 characters"
-
-    return None
+def limit_body(max_bytes: int, too_large_error):
+    """Decorator that answers bodies over max_bytes with too_large_error before the handler parses them."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # A declared length is checked without reading; chunked bodies are read (and
+            # cached for the handler) up to MAX_CONTENT_LENGTH and then measured
+            if request.content_length is not None:
+                too_large = request.content_length > max_bytes
+            else:
+                too_large = len(request.get_data()) > max_bytes
+            if too_large:
+                return static_error(too_large_error)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+class DispatchCallRequest(BaseModel):
+    """Dispatch-call payload, parsed and validated in one pass; whitespace is stripped first."""
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    first_name: str = Field(min_length=1, max_length=50)
+    last_name: str = Field(min_length=1, max_length=50)
+    phone_number: str = Field(min_length=1)
+    address: str = TEST_ADDRESS
+
+
+_REQUIRED_FIELDS = ('first_name', 'last_name', 'phone_number')
+_TOO_LONG_MESSAGES = {
+    'first_name': "Names must be less than 50 characters",
+    'last_name': "Names must be less than 50 characters",
+}
+
+
+def validation_error(error: ValidationError) -> Tuple[str, str]:
+    """Translate a DispatchCallRequest validation failure into the API's (error, message) pair."""
+    errors = error.errors()
+
+    # Missing (or empty) required fields are reported first, in field order
+    for field in _REQUIRED_FIELDS:
+        for err in errors:
+            if err['loc'] == (field,) and (err['type'] == 'missing' or not err.get('input')):
+                return 'Validation error', f"Missing required field: {field}"
+
+    # A whitespace-only phone number is stripped to '' and fails the phone check, which
+    # only runs once every other field is valid
+    errors = [err for err in errors if err['loc'] != ('phone_number',) or err['type'] != 'string_too_short']
+    if not errors:
+        return 'Invalid phone number', 'Phone number  is not a valid US phone number'
+
+    err = errors[0]
+    if err['type'] == 'json_invalid':
+        return 'Validation error', "Request body must be valid JSON"
+    if not err['loc']:
+        return 'Validation error', "Request body must be a JSON object"
+
+    field = err['loc'][0]
+    if err['type'] == 'string_too_short' and field in ('first_name', 'last_name'):
+        return 'Validation error', "First name and last name must be at least 1 character"
+    if err['type'] == 'string_too_long':
+        return 'Validation error', _TOO_LONG_MESSAGES[field]
+    return 'Validation error', f"Invalid value for field: {field}"
 
 
 @app.route('/health', methods=['GET'])
@@ -80,8 +247,167 @@ def health_check():
     })
 
 
+def prepare_call(data: Union[bytes, Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Validate one dispatch payload (raw JSON body or an already-decoded object) and build
+    its room name and metadata.
+
+    Returns (call, None) on success, or (None, error_body) describing why the payload was rejected.
+    """
+    # Parse, validate and strip the payload in one pass
+    try:
+        if isinstance(data, bytes):
+            payload = DispatchCallRequest.model_validate_json(data)
+        else:
+            payload = DispatchCallRequest.model_validate(data)
+    except ValidationError as e:
+        error, message = validation_error(e)
+        return None, {
+            'success': False,
+            'error': error,
+            'message': message
+        }
+
+    first_name = payload.first_name
+    last_name = payload.last_name
+    phone_number = payload.phone_number
+    address = payload.address
+
+    # Validate phone number; the length bound keeps oversized junk out of the validator cache.
+    # No ASCII check here: pasted numbers often carry NBSPs, bidi marks or non-breaking hyphens.
+    validated_phone = len(phone_number) <= MAX_PHONE_CHARS and validate_phone_number(phone_number)
+    if not validated_phone:
+        return None, {
+            'success': False,
+            'error': 'Invalid phone number',
+            'message': f'Phone number {phone_number} is not a valid US phone number'
+        }
+
+    # Generate lead ID and room name
+    # The counter suffix keeps lead IDs unique when several requests land in the same second
+    timestamp = f"{time.strftime('%Y%m%d_%H%M%S')}_{next(_LEAD_COUNTER) % 1000000:06d}"
+    lead_id = f"{first_name.lower()}_{last_name.lower()}_{timestamp}"
+    # validate_phone_number guarantees +1XXXXXXXXXX, so dropping the '+' is enough
+    room_name = f"outbound_call_{validated_phone[1:]}_{lead_id}"
+
+    # One timestamp per call, shared by the dispatch metadata and the API response
+    now_iso = datetime.utcnow().isoformat()
+
+    # Per-call metadata fields, appended to the pre-encoded template
+    metadata = {
+        "phone_number": validated_phone,
+        "lead_id": lead_id,
+        "customer_info": {
+            "first_name": first_name,
+            "last_name": last_name,
+            "address": address
+        },
+        "timestamp": now_iso
+    }
+
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'phone_number': validated_phone,
+        'address': address,
+        'lead_id': lead_id,
+        'room_name': room_name,
+        'metadata_json': (_METADATA_PREFIX + orjson.dumps(metadata)[1:]).decode(),
+        'timestamp': now_iso
+    }, None
+
+
+async def dispatch_with_livekit_api(room_name: str, metadata_json: str) -> bool:
+    """Use LiveKit Python API to dispatch the call."""
+    try:
+        # Reuse the worker's LiveKit client and its connection pool
+        api = get_livekit_client()
+
+        # Create room first
+        room_request = CreateRoomRequest(name=room_name)
+        room = await api.room.create_room(room_request)
+        logger.info("Created room: %s", room.name)
+
+        # Create agent dispatch request
+        dispatch_request = CreateAgentDispatchRequest(
+            room=room_name,
+            agent_name=AGENT_NAME,
+            metadata=metadata_json
+        )
+
+        # Dispatch the agent
+        dispatch_response = await api.agent_dispatch.create_dispatch(dispatch_request)
+        logger.debug("Dispatch successful: %s", dispatch_response)
+        return True
+
+    except (TwirpError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error("LiveKit API dispatch failed: %s", e)
+        return False
+
+
+async def _dispatch_all(calls: List[Dict[str, Any]]) -> List[bool]:
+    """Dispatch calls concurrently on the dispatch loop, each bounded by DISPATCH_TIMEOUT."""
+    results = await asyncio.gather(
+        *(asyncio.wait_for(dispatch_with_livekit_api(call['room_name'], call['metadata_json']), timeout=DISPATCH_TIMEOUT)
+          for call in calls),
+        return_exceptions=True
+    )
+    for call, result in zip(calls, results):
+        if isinstance(result, BaseException):
+            logger.error("LiveKit dispatch to %s failed: %r", call['phone_number'], result)
+    return [result is True for result in results]
+
+
+def run_dispatches(calls: List[Dict[str, Any]]) -> List[bool]:
+    """
+    Dispatch prepared calls from a request thread and return one success flag per call.
+
+    All calls run concurrently on the shared background loop over the worker's pooled
+    LiveKit client; wait_for bounds each one on the loop itself, so a hung LiveKit call
+    is cancelled there rather than left running.
+    """
+    future = asyncio.run_coroutine_threadsafe(_dispatch_all(calls), get_dispatch_loop())
+    try:
+        return future.result(timeout=DISPATCH_TIMEOUT + 1)
+    except (concurrent.futures.TimeoutError, asyncio.TimeoutError):
+        future.cancel()
+        logger.error("LiveKit dispatch timed out after %ss", DISPATCH_TIMEOUT)
+        return [False] * len(calls)
+
+
+def dispatch_result(call: Dict[str, Any], success: bool) -> Dict[str, Any]:
+    """Build the response body for one dispatched (or failed) call."""
+    if success:
+        return {
+            'success': True,
+            'call_id': call['room_name'],
+            'lead_id': call['lead_id'],
+            'phone_number': call['phone_number'],
+            'customer_name': f"{call['first_name']} {call['last_name']}",
+            'address': call['address'],
+            'message': f"Call dispatched successfully to {call['first_name']} {call['last_name']}",
+            'timestamp': call['timestamp']
+        }
+
+    return {
+        'success': False,
+        'error': 'Dispatch failed',
+        'message': f"Failed to dispatch call to {call['phone_number']}",
+        'phone_number': call['phone_number']
+    }
+
+
+def livekit_credentials_error():
+    """Return an error response if LiveKit is not configured, else None."""
+    if LIVEKIT_URL and LIVEKIT_API_KEY and LIVEKIT_API_SECRET:
+        return None
+    logger.error("Missing LiveKit credentials")
+    return static_error(_ERR_CONFIG)
+
+
 @app.route('/api/v1/dispatch-call', methods=['POST'])
 @require_api_key
+@limit_body(MAX_CALL_BODY_BYTES, _ERR_CALL_TOO_LARGE)
 def dispatch_call():
     """
     Dispatch an outbound call to a potential customer.
@@ -97,122 +423,113 @@ def dispatch_call():
     try:
         # Parse JSON data
         if not request.is_json:
-            return jsonify({
-                'success': False,
-                'error': 'Content-Type must be application/json'
-            }), 400
+            return static_error(_ERR_NOT_JSON)
 
-        data = request.get_json()
+        call, error_body = prepare_call(request.get_data())
+        if error_body:
+            return jsonify(error_body), 400
 
-        # Validate request data
-        validation_error = validate_request_data(data)
-        if validation_error:
-            return jsonify({
-                'success': False,
-                'error': 'Validation error',
-                'message': validation_error
-            }), 400
-
-        # Extract and clean data
-        first_name = data['first_name'].strip()
-        last_name = data['last_name'].strip()
-        phone_number = data['phone_number'].strip()
-        address = data.get('address', TEST_ADDRESS).strip()
-
-        # Validate phone number
-        validated_phone = validate_phone_number(phone_number)
-        if not validated_phone:
-            return jsonify({
-                'success': False,
-                'error': 'Invalid phone number',
-                'message': f'Phone number {phone_number} is not a valid US phone number'
-            }), 400
-
-        # Generate lead ID and room name
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        lead_id = f"{first_name.lower()}_{last_name.lower()}_{timestamp}"
-        room_name = f"outbound_call_{validated_phone.replace('+', '').replace('-', '')}_{lead_id}"
-
-        # Create metadata for the call
-        metadata = {
-            "phone_number": validated_phone,
-            "lead_id": lead_id,
-            "call_type": "sales_outbound",
-            "agent_name": "Jack",
-            "customer_info": {
-                "first_name": first_name,
-                "last_name": last_name,
-                "address": address
-            },
-            "initiated_via": "web_api",
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        config_error = livekit_credentials_error()
+        if config_error:
+            return config_error
+
+        logger.info("Dispatching call to: %s for %s %s", call['phone_number'], call['first_name'], call['last_name'])
+        dispatch_success, = run_dispatches([call])
+        response_data = dispatch_result(call, dispatch_success)
 
-        # Get agent name from environment
-        agent_name = os.getenv("AGENT_NAME", "outbound_call_agent")
-
-        # Build LiveKit CLI command
-        command = f"lk dispatch create --new-room --room {room_name} --agent-name {agent_name} --metadata '{json.dumps(metadata)}'"
-
-        # Execute the command
-        logger.info(f"Dispatching call to: {validated_phone} for {first_name} {last_name}")
-        result = os.system(command)
-
-        if result == 0:
-            # Success response
-            response_data = {
-                'success': True,
-                'call_id': room_name,
-                'lead_id': lead_id,
-                'phone_number': validated_phone,
-                'customer_name': f"{first_name} {last_name}",
-                'address': address,
-                'message': f'Call dispatched successfully to {first_name} {last_name}',
-                'timestamp': datetime.utcnow().isoformat()
-            }
-
-            logger.info(f"Call dispatched successfully: {room_name}")
+        if dispatch_success:
+            logger.info("Call dispatched successfully: %s", call['room_name'])
             return jsonify(response_data), 200
 
-        else:
-            # Command failed
-            error_msg = f'Failed to dispatch call to {validated_phone}'
-            logger.error(f"Command failed with code {result}: {error_msg}")
+        logger.error("Dispatch failed: %s", response_data['message'])
+        return jsonify(response_data), 500
+
+    except Exception as e:
+        logger.error("Unexpected error in dispatch_call: %s", e)
+        return static_error(_ERR_DISPATCH_INTERNAL)
+
 
-            return jsonify({
+@app.route('/api/v1/dispatch-calls', methods=['POST'])
+@require_api_key
+@limit_body(MAX_BATCH_BODY_BYTES, _ERR_TOO_LARGE)
+def dispatch_calls():
+    """
+    Dispatch a burst of outbound calls in one request.
+
+    Expected JSON payload: a list of dispatch-call payloads (or {"calls": [...]}), at most
+    MAX_BATCH_CALLS long. Invalid entries are reported individually; the valid ones are
+    dispatched concurrently. Results are returned in request order.
+    """
+    try:
+        # Parse JSON data
+        if not request.is_json:
+            return static_error(_ERR_NOT_JSON)
+
+        # Parse here rather than with get_json(), whose BadRequest would surface as a 500 below
+        try:
+            payload = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            return static_error(_ERR_INVALID_JSON)
+        if isinstance(payload, dict):
+            payload = payload.get('calls')
+        if not isinstance(payload, list) or not payload:
+            return static_error(_ERR_EMPTY_BATCH)
+        if len(payload) > MAX_BATCH_CALLS:
+            return static_error(_ERR_BATCH_TOO_LARGE)
+
+        config_error = livekit_credentials_error()
+        if config_error:
+            return config_error
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(payload)
+        calls, positions = [], []
+        for i, data in enumerate(payload):
+            call, error_body = prepare_call(data) if isinstance(data, dict) else (None, {
                 'success': False,
-                'error': 'Dispatch failed',
-                'message': error_msg,
-                'phone_number': validated_phone
-            }), 500
+                'error': 'Validation error',
+                'message': 'Each call must be a JSON object'
+            })
+            if error_body:
+                results[i] = error_body
+            else:
+                calls.append(call)
+                positions.append(i)
+
+        if calls:
+            logger.info("Dispatching %d call(s) in one batch", len(calls))
+            for i, call, dispatch_success in zip(positions, calls, run_dispatches(calls)):
+                results[i] = dispatch_result(call, dispatch_success)
+
+        dispatched = sum(1 for result in results if result['success'])
+        logger.info("Batch dispatched %d/%d call(s)", dispatched, len(results))
+        return jsonify({
+            'success': dispatched == len(results),
+            'dispatched': dispatched,
+            'total': len(results),
+            'results': results
+        }), 200
 
     except Exception as e:
-        logger.error(f"Unexpected error in dispatch_call: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': 'Internal server error',
-            'message': 'An unexpected error occurred while processing the request'
-        }), 500
+        logger.error("Unexpected error in dispatch_calls: %s", e)
+        return static_error(_ERR_DISPATCH_INTERNAL)
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({
-        'success': False,
-        'error': 'Not found',
-        'message': 'The requested endpoint does not exist'
-    }), 404
+    return static_error(_ERR_NOT_FOUND)
+
+
+@app.errorhandler(413)
+def payload_too_large(error):
+    """Handle 413 errors."""
+    return static_error(_ERR_TOO_LARGE)
 
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
-    return jsonify({
-        'success': False,
-        'error': 'Internal server error',
-        'message': 'An unexpected error occurred'
-    }), 500
+    return static_error(_ERR_INTERNAL)
 
 
 if __name__ == '__main__':